@@ -3,7 +3,10 @@ import os
 import requests
 import json
 import asyncio
+import logging
+import threading
 import aiohttp
+from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional, Union, List, Tuple
 
 # Import logging module
@@ -46,6 +49,12 @@ class Agent:
         self.tavily_api_url = "https://api.tavily.com/search"
         self.openrouter_api_url = "https://openrouter.ai/api/v1/chat/completions"
         
+        # Shared HTTP session for async calls; set by the caller to pool connections
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        
+        # Sessions for sync calls, one per thread since sync agents run on several executor threads at once
+        self._requests_local = threading.local()
+        
         self.logger.debug(f"Initialized {self.name} agent")
     
     def workflow_step(self, step_num: int, total_steps: int, message: str):
@@ -59,7 +68,7 @@ class Agent:
         """
         self.logger.info(f"[{step_num}/{total_steps}] {message}")
     
-    def progress_update(self, current: int, total: int, operation: str):
+    def progress_update(self, current: int, total: int, operation: str, step: Optional[int] = None):
         """
         Log a progress update for a multi-part operation.
         
@@ -67,12 +76,37 @@ class Agent:
             current (int): Current progress
             total (int): Total items to process
             operation (str): Description of the operation
+            step (Optional[int]): Progress interval logged at INFO level. Computed from total if not given;
+                pass a precomputed value when calling in a loop.
         """
+        if step is None:
+            step = max(1, total // 4)
+        
         # Only log at INFO level for 25%, 50%, 75% and 100% progress
-        if current == 1 or current == total or current % max(1, (total // 4)) == 0:
-            self.logger.info(f"{operation}... ({current}/{total} complete)")
+        if current == 1 or current == total or current % step == 0:
+            self.logger.info("%s... (%d/%d complete)", operation, current, total)
+        elif self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s... (%d/%d complete)", operation, current, total)
+    
+    @asynccontextmanager
+    async def _get_http_session(self):
+        """
+        Yield the shared HTTP session if one is set, otherwise a temporary session.
+        """
+        if self.http_session is not None and not self.http_session.closed:
+            yield self.http_session
         else:
-            self.logger.debug(f"{operation}... ({current}/{total} complete)")
+            async with aiohttp.ClientSession() as session:
+                yield session
+    
+    def _get_requests_session(self) -> requests.Session:
+        """
+        Return the calling thread's sync HTTP session, creating it on first use in that thread.
+        """
+        session = getattr(self._requests_local, "session", None)
+        if session is None:
+            session = self._requests_local.session = requests.Session()
+        return session
     
     def call_llm_api(self, 
                      prompt: str, 
@@ -200,7 +234,7 @@ class Agent:
         
         try:
             self.logger.debug(f"Calling {provider} API with model {model}")
-            response = requests.post(api_url, headers=headers, json=data)
+            response = self._get_requests_session().post(api_url, headers=headers, json=data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -218,12 +252,26 @@ class Agent:
             self.logger.error(f"Exception when calling {provider} API: {e}")
             return None
     
+    @staticmethod
+    def _cacheable_system_blocks(system_message: str) -> List[Dict[str, Any]]:
+        """
+        Wrap a system message in a content block marked for Anthropic prompt caching.
+        
+        Args:
+            system_message (str): The system message
+            
+        Returns:
+            List[Dict[str, Any]]: System content blocks with an ephemeral cache_control marker
+        """
+        return [{"type": "text", "text": system_message, "cache_control": {"type": "ephemeral"}}]
+    
     async def call_llm_api_async(self, 
                            prompt: str, 
                            system_message: str = "", 
                            model: str = "openrouter/quasar-alpha", 
                            temperature: float = 0.5,
-                           response_format: Optional[Dict[str, Any]] = None) -> Optional[str]:
+                           response_format: Optional[Dict[str, Any]] = None,
+                           cache_system_prompt: bool = False) -> Optional[str]:
         """
         Async version: Make a call to the appropriate provider API with standardized error handling.
         
@@ -233,6 +281,7 @@ class Agent:
             model (str, optional): The model to use. Defaults to "deepseek/deepseek-chat-v3-0324".
             temperature (float, optional): The temperature parameter. Defaults to 0.5.
             response_format (Dict[str, Any], optional): Format specification for structured outputs. Defaults to None.
+            cache_system_prompt (bool, optional): Mark the system message for provider prompt caching on Anthropic models. Defaults to False.
             
         Returns:
             Optional[str]: The response content or None if the call failed
@@ -256,10 +305,15 @@ class Agent:
                 "Content-Type": "application/json",
             }
             
+            # OpenRouter passes cache_control through to Anthropic models
+            system_content = system_message
+            if cache_system_prompt and model.startswith("anthropic/"):
+                system_content = self._cacheable_system_blocks(system_message)
+            
             data = {
                 "model": model,
                 "messages": [
-                    {"role": "system", "content": system_message},
+                    {"role": "system", "content": system_content},
                     {"role": "user", "content": prompt}
                 ],
                 "temperature": temperature
@@ -314,7 +368,7 @@ class Agent:
             # Anthropic has a different request format
             data = {
                 "model": model,
-                "system": system_message,
+                "system": self._cacheable_system_blocks(system_message) if cache_system_prompt else system_message,
                 "messages": [
                     {"role": "user", "content": prompt}
                 ],
@@ -347,7 +401,7 @@ class Agent:
         
         try:
             self.logger.debug(f"Calling {provider} API asynchronously with model {model}")
-            async with aiohttp.ClientSession() as session:
+            async with self._get_http_session() as session:
                 async with session.post(api_url, headers=headers, json=data) as response:
                     if response.status == 200:
                         result = await response.json()
@@ -403,7 +457,7 @@ class Agent:
         
         try:
             self.logger.debug(f"Calling Tavily API with query: {query}")
-            response = requests.post(self.tavily_api_url, headers=headers, json=data)
+            response = self._get_requests_session().post(self.tavily_api_url, headers=headers, json=data)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -452,7 +506,7 @@ class Agent:
         self.logger.debug(f"Calling Tavily API asynchronously with query: {query}")
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self._get_http_session() as session:
                 async with session.post(self.tavily_api_url, headers=headers, json=data) as response:
                     if response.status == 200:
                         return await response.json()
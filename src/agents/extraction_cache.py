@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+import os
+import json
+import struct
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# Import logging module
+try:
+    # Try relative import
+    from ..logging_config import get_class_logger
+except ImportError:
+    # Try absolute import
+    from logging_config import get_class_logger
+
+class ExtractionCache:
+    """
+    Content-addressable disk cache for parsed LLM outputs.
+
+    Entries are stored as JSON files named by a hash of everything that
+    determines the LLM output (prompt, model, temperature and input text),
+    so an identical request can skip the API call entirely.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        Initialize the cache in the given directory.
+
+        Args:
+            cache_dir (Union[str, Path]): Directory to store cache entries in
+        """
+        self.logger = get_class_logger(self.__class__)
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def make_key(*parts: Union[str, bytes, float]) -> str:
+        """
+        Build a cache key from the parts of a request.
+        Each part is length-prefixed so that different splits of the same bytes can't collide.
+
+        Args:
+            *parts (Union[str, bytes, float]): The request parts, e.g. system prompt, model, temperature and input
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, float):
+                data = struct.pack(">d", part)
+            elif isinstance(part, str):
+                data = part.encode("utf-8")
+            else:
+                data = part
+            digest.update(struct.pack(">Q", len(data)))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Load a cached value.
+
+        Args:
+            key (str): The cache key
+
+        Returns:
+            Optional[Any]: The cached value or None if not found or unreadable
+        """
+        try:
+            with self._path(key).open('r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, IOError) as e:
+            self.logger.error(f"Error reading cache entry {key}: {e}")
+            return None
+
+    def put(self, key: str, value: Any) -> bool:
+        """
+        Store a value, replacing any existing entry atomically.
+
+        Args:
+            key (str): The cache key
+            value (Any): A JSON-serializable value
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            # Created on first write so constructing a cache has no side effects
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(value, f)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            return True
+        except (IOError, TypeError, ValueError) as e:
+            self.logger.error(f"Error saving cache entry {key}: {e}")
+            return False
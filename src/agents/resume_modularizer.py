@@ -1,97 +1,151 @@
 #!/usr/bin/env python3
 import os
+import re
+import json
 import yaml
 import asyncio
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Tuple, Union
 import copy
+from pathlib import Path
 
 from .base_agent import Agent
+from .extraction_cache import ExtractionCache
 
-class ResumeModularizer(Agent):
-    """
-    Agent responsible for converting a simple resume bullet point into a modular format
-    that can be customized for different job applications.
-    """
-    
-    def __init__(self):
-        super().__init__(name="ResumeModularizer")
-        
-        # Load system prompt from Agent_Instruction.md
-        self.system_prompt = """
-        You will be provided a bullet point from a resume. You are to provide a structured output in YAML. The output will serve as a modular structure that a subsequent LLM will use to customize resume points based on a given job description.
+# Prefer the libyaml-backed loader/dumper when available
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
 
-        ## Variable Creation Guidelines
+# Line width passed to yaml.dump so long bullet points are never wrapped
+_NO_LINE_WRAP = 10**9
 
-        When deciding what elements to turn into variables versus keeping as static text:
+# Fenced code block in an LLM response; an unterminated fence runs to the end of the response
+_FENCE_RE = re.compile(r"```(?:json)?(.*?)(?:```|\Z)", re.DOTALL)
 
-        1. **Action verbs and first words** should become variables to prevent repetition across multiple resume points in the final document.
+# Bump whenever SYSTEM_PROMPT changes so cached conversions made with an older prompt are not reused
+PROMPT_VERSION = "3"
 
-        2. **Technology terms** that commonly appear with different nomenclatures in job postings (e.g., "Microsoft 365" vs "M365" vs "Office 365" vs etc) should be variables to enable easier matching with job requirements.
+# System prompt for bullet point conversion (adapted from Agent_Instruction.md).
+# Kept constant across calls so the provider can cache it as a prompt prefix.
+SYSTEM_PROMPT = """You will be provided a bullet point from a resume. You are to provide a structured output as a single JSON object. The output will serve as a modular structure that a subsequent LLM will use to customize resume points based on a given job description.
 
-        3. **Related technologies** should be split into separate variables when they might appear independently in job postings (e.g., separate "Microsoft 365" and "Entra ID" rather than combining them).
+## Variable Creation Guidelines
 
-        4. **Avoid potential redundancies** - If a section might create word repetition when combined with other variable choices, make it modular. For example, if one variable option is "Managed," avoid having "managing" in static text, or vice versa.
+When deciding what elements to turn into variables versus keeping as static text:
 
-        5. **Provide context in variable options** - Each modular component should maintain enough context that an AI agent can confidently choose an option.
+1. **Action verbs and first words** should become variables to prevent repetition across multiple resume points in the final document.
 
-        6. **Do not overmodularize** - Take the following senetence as an example: "Redesigned 12+ administrative processes using standardized templates and approval workflows, reducing new client onboarding time from 18 days to 4 days and improving customer request response time by 25%." It's not necessary to turn the metrics into seperate modular components. Now that doesn't mean you're not allowed to or shouldn't modularize metrics but the reason should be worthwhile. The point about overmodularizing applies to other parts of a sentence as well, not just metrics.
+2. **Technology terms** that commonly appear with different nomenclatures in job postings (e.g., "Microsoft 365" vs "M365" vs "Office 365" vs etc) should be variables to enable easier matching with job requirements.
 
-        7. When creating variable options for action verbs, avoid using overused, clichéd language. For example, "spearheaded" is a clichéd action verb. Streamlined is another clichéd action verb, albiet more acceptable so long as it's used in the right context.
-        
-        ## Output Format
+3. **Related technologies** should be split into separate variables when they might appear independently in job postings (e.g., separate "Microsoft 365" and "Entra ID" rather than combining them).
 
-        ```yaml
-        original_sentence: "The original resume bullet point"
-        modular_sentence: "A template with {variable} placeholders that maintains proper grammar and flow"
-        variables:
-        variable_name:
-            - "Option 1"
-            - "Option 2 (synonym or alternative phrasing)"
-            - "Option 3 (may include adjacent terms relevant to job postings)"
-        ```
+4. **Avoid potential redundancies** - If a section might create word repetition when combined with other variable choices, make it modular. For example, if one variable option is "Managed," avoid having "managing" in static text, or vice versa.
 
-        **Example:**
-        Input: "Administered Microsoft 365 and Entra ID, configuring dynamic security groups and conditional access policies, and optimizing license management"
+5. **Provide context in variable options** - Each modular component should maintain enough context that an AI agent can confidently choose an option.
 
-        ```yaml
-        original_sentence: "Administered Microsoft 365 and Entra ID, configuring dynamic security groups and conditional access policies, and optimizing license management"
-        modular_sentence: "{action} {microsoft} and {cloud_directory}, configuring dynamic security groups and conditional access policies, and {tasks}"
-        variables:
-        action:
-            - "Managed"
-            - "Administered"
-        microsoft:
-            - "Microsoft 365"
-            - "M365"
-            - "Office 365"
-            - "O365"
-        cloud_directory:
-            - "Entra ID"
-            - "Azure AD"
-            - "Azure Active Directory"
-            - "Microsoft Entra ID"
-            - "Microsoft Azure AD"
-        tasks:
-            - "optimizing license management"
-            - "optimizing license assignments"
-        ```
-        """
+6. **Do not overmodularize** - Take the following senetence as an example: "Redesigned 12+ administrative processes using standardized templates and approval workflows, reducing new client onboarding time from 18 days to 4 days and improving customer request response time by 25%." It's not necessary to turn the metrics into seperate modular components. Now that doesn't mean you're not allowed to or shouldn't modularize metrics but the reason should be worthwhile. The point about overmodularizing applies to other parts of a sentence as well, not just metrics.
+
+7. When creating variable options for action verbs, avoid using overused, clichéd language. For example, "spearheaded" is a clichéd action verb. Streamlined is another clichéd action verb, albiet more acceptable so long as it's used in the right context.
+
+## Output Format
+
+Do not repeat the original bullet point in your output; it is attached to your output automatically.
+
+```json
+{
+    "modular_sentence": "A template with {variable} placeholders that maintains proper grammar and flow",
+    "variables": {
+        "variable_name": [
+            "Option 1",
+            "Option 2 (synonym or alternative phrasing)",
+            "Option 3 (may include adjacent terms relevant to job postings)"
+        ]
+    }
+}
+```
+
+**Example:**
+Input: "Administered Microsoft 365 and Entra ID, configuring dynamic security groups and conditional access policies, and optimizing license management"
+
+```json
+{
+    "modular_sentence": "{action} {microsoft} and {cloud_directory}, configuring dynamic security groups and conditional access policies, and {tasks}",
+    "variables": {
+        "action": ["Managed", "Administered"],
+        "microsoft": ["Microsoft 365", "M365", "Office 365", "O365"],
+        "cloud_directory": ["Entra ID", "Azure AD", "Azure Active Directory", "Microsoft Entra ID", "Microsoft Azure AD"],
+        "tasks": ["optimizing license management", "optimizing license assignments"]
+    }
+}
+```
+"""
+
+class ResumeModularizer(Agent):
+    """
+    Agent responsible for converting a simple resume bullet point into a modular format
+    that can be customized for different job applications.
+    """
+    
+    # The 3.7 Sonnet model provides the best results for this task
+    # Deepseek V3 0324 and o1-mini has also shown to produce decent results and are a cheaper option
+    MODEL = "anthropic/claude-3.7-sonnet"
+    TEMPERATURE = 0.5
     
-    async def run(self, bullet_point: str, group_index: int) -> Dict[str, Any]:
+    # Version of SYSTEM_PROMPT, for callers that cache conversion output
+    PROMPT_VERSION = PROMPT_VERSION
+    
+    # Total LLM calls per bullet point, including retries after unusable output
+    MAX_CONVERSION_ATTEMPTS = 3
+    
+    def __init__(self):
+        super().__init__(name="ResumeModularizer")
+        
+        # Cache of converted bullet points, keyed by prompt version, prompt, model, temperature and bullet text
+        self.cache = ExtractionCache(Path("data/modularizer_cache"))
+        
+        self.system_prompt = SYSTEM_PROMPT
+    
+    async def run(self, bullet_point: Union[str, Dict[str, Any]], group_index: int, use_cache: bool = True) -> Dict[str, Any]:
         """
         Convert a simple resume bullet point into a modular structure.
         
         Args:
-            bullet_point (str): The bullet point to convert
+            bullet_point (Union[str, Dict[str, Any]]): The bullet point to convert, or one already in modular form
             group_index (int): The group index for organization in the output
+            use_cache (bool): Whether to reuse a cached conversion of this bullet point. Fresh conversions are cached either way.
             
         Returns:
             Dict[str, Any]: The modular structure for this bullet point
         """
+        modular_point, _ = await self._run_with_status(bullet_point, group_index, use_cache)
+        return modular_point
+    
+    async def _run_with_status(self, bullet_point: Union[str, Dict[str, Any]], group_index: int,
+                               use_cache: bool = True) -> Tuple[Dict[str, Any], bool]:
+        """
+        Convert a bullet point like run(), also reporting whether the conversion succeeded.
+        
+        Args:
+            bullet_point (Union[str, Dict[str, Any]]): The bullet point to convert, or one already in modular form
+            group_index (int): The group index for organization in the output
+            use_cache (bool): Whether to reuse a cached conversion of this bullet point
+            
+        Returns:
+            Tuple[Dict[str, Any], bool]: The modular structure and False if it is the basic fallback structure
+        """
+        # Bullet points that are already modular need no conversion
+        if self._is_valid_modular_point(bullet_point):
+            self.logger.debug(f"Bullet point {group_index} is already modular. Skipping conversion.")
+            return {**bullet_point, "id": f"{group_index:02d}"}, True
+        
+        # Entries that only look modular (e.g. an earlier basic fallback structure) are converted from their original sentence
+        if isinstance(bullet_point, dict) and isinstance(bullet_point.get("original_sentence"), str):
+            bullet_point = bullet_point["original_sentence"]
         
         self.logger.info(f"Processing bullet point {group_index}: {bullet_point[:50]}...")
         
-        modular_point = await self._convert_bullet_point(bullet_point)
+        modular_point = await self._convert_bullet_point(bullet_point, use_cache)
         
         if not modular_point:
             # Return basic structure if conversion failed
@@ -101,59 +155,106 @@ class ResumeModularizer(Agent):
                 "modular_sentence": [bullet_point.replace(".", "")],
                 "variables": {},
                 "id": f"{group_index:02d}"  # Add a zero-padded ID
-            }
+            }, False
         
         # Add a simple sequential ID to the modular structure
         modular_point["id"] = f"{group_index:02d}"  # Format as 01, 02, etc.
         
-        return modular_point
+        return modular_point, True
     
-    async def _convert_bullet_point(self, bullet_point: str) -> Optional[Dict[str, Any]]:
+    async def _convert_bullet_point(self, bullet_point: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Use AI to convert a bullet point into a modular structure.
         
         Args:
             bullet_point (str): The bullet point to convert
+            use_cache (bool): Whether to reuse a cached conversion of this bullet point
             
         Returns:
             Optional[Dict[str, Any]]: The modular structure or None if the conversion failed
         """
         prompt = bullet_point
         
-        # The 3.7 Sonnet model provides the best results for this task
-        # Deepseek V3 0324 and o1-mini has also shown to produce decent results and are a cheaper option
-        self.logger.debug(f"Converting bullet point using claude-3-7-sonnet model")
-        response = await self.call_llm_api_async(
-            prompt=prompt,
-            system_message=self.system_prompt,
-            model="anthropic/claude-3.7-sonnet",
-            temperature=0.5
-        )
+        # Skip the API call if this exact bullet point was converted before
+        cache_key = ExtractionCache.make_key(PROMPT_VERSION, self.system_prompt, self.MODEL, self.TEMPERATURE, bullet_point)
+        cached = self.cache.get(cache_key) if use_cache else None
+        if self._is_valid_modular_point(cached):
+            self.logger.debug("Using cached conversion for bullet point")
+            # Entries cached before the bullet was always attached verbatim may hold a paraphrase
+            cached["original_sentence"] = bullet_point
+            return cached
         
-        if not response:
-            return None
+        self.logger.debug(f"Converting bullet point using {self.MODEL} model")
+        for attempt in range(1, self.MAX_CONVERSION_ATTEMPTS + 1):
+            response = await self.call_llm_api_async(
+                prompt=prompt,
+                system_message=self.system_prompt,
+                model=self.MODEL,
+                temperature=self.TEMPERATURE,
+                cache_system_prompt=True
+            )
             
-        try:
-            # Extract the YAML section from the response (the response might include markdown code block indicators)
-            yaml_section = response
-            if "```yaml" in response:
-                yaml_section = response.split("```yaml", 1)[1]
-                if "```" in yaml_section:
-                    yaml_section = yaml_section.split("```", 1)[0]
-            elif "```" in response:
-                yaml_section = response.split("```", 1)[1]
-                if "```" in yaml_section:
-                    yaml_section = yaml_section.split("```", 1)[0]
-            
-            # Parse the YAML
-            parsed_yaml = yaml.safe_load(yaml_section)
+            if not response:
+                return None
+                
+            try:
+                # Extract the JSON object from the response (the response might include markdown code block indicators)
+                # A plain substring check is much cheaper than the regex and is enough when there is no fence
+                fence_match = _FENCE_RE.search(response) if "```" in response else None
+                if fence_match:
+                    json_section = fence_match.group(1)
+                else:
+                    # Fall back to the outermost braces in case the model added prose around the object
+                    json_section = response[response.find("{"):response.rfind("}") + 1] or response
                 
-            return parsed_yaml
+                # Parse the JSON
+                parsed_json = json.loads(json_section)
+                
+                if not self._is_valid_modular_point(parsed_json):
+                    raise ValueError(
+                        'expected a JSON object with a "modular_sentence" string and a "variables" object '
+                        'mapping each variable name to a list of option strings'
+                    )
+                
+                # Attach the original bullet point verbatim rather than having the model regenerate it,
+                # discarding any copy the model echoed back anyway
+                parsed_json.pop("original_sentence", None)
+                parsed_json = {"original_sentence": bullet_point, **parsed_json}
+                self.cache.put(cache_key, parsed_json)
+                return parsed_json
+                
+            except ValueError as e:
+                self.logger.warning(f"Error parsing conversion output (attempt {attempt}/{self.MAX_CONVERSION_ATTEMPTS}): {e}")
+                self.logger.debug(f"Response: {response}")
+                
+                # Feed the error back so the next attempt can correct it
+                prompt = (
+                    f"{bullet_point}\n\n"
+                    f"Your previous output was:\n{response}\n\n"
+                    f"It could not be used: {e}. Respond again with only the corrected JSON object."
+                )
+        
+        self.logger.error(f"Conversion failed after {self.MAX_CONVERSION_ATTEMPTS} attempts")
+        return None
+    
+    @staticmethod
+    def _is_valid_modular_point(modular_point: Any) -> bool:
+        """
+        Check that a parsed conversion has the structure expected of a modular point.
+        
+        Args:
+            modular_point (Any): The parsed conversion output
             
-        except Exception as e:
-            self.logger.error(f"Error parsing conversion output: {e}")
-            self.logger.debug(f"Response: {response}")
-            return None
+        Returns:
+            bool: True if the output can be used as a modular point
+        """
+        if not isinstance(modular_point, dict) or not isinstance(modular_point.get("modular_sentence"), str):
+            return False
+        variables = modular_point.get("variables")
+        return isinstance(variables, dict) and all(
+            isinstance(options, list) and all(isinstance(option, str) for option in options)
+            for options in variables.values()
+        )
     
     # async def _generate_tags(self, modular_structure: Dict[str, Any]) -> str:
     #     """
@@ -198,99 +299,84 @@ class ResumeModularizer(Agent):
             
     #     return response.strip()
 
-    async def process_resume(self, simple_resume_path: str) -> Dict[str, Any]:
+    async def process_resume(self, simple_resume_path: str, use_cache: bool = True) -> Tuple[Optional[Dict[str, Any]], bool]:
         """
         Process an entire resume file, converting bullet points into modular structures.
-        Uses asyncio.gather to process multiple bullet points concurrently.
+        Uses asyncio.gather to process the bullet points of all work experiences
+        and projects concurrently.
         
         Args:
             simple_resume_path (str): Path to the simple resume YAML file
+            use_cache (bool): Whether to reuse cached conversions of individual bullet points
             
         Returns:
-            Dict[str, Any]: The modular resume structure
+            Tuple[Optional[Dict[str, Any]], bool]: The modular resume structure (None on error), and whether
+                every bullet point was converted rather than replaced by the basic fallback structure
         """
         self.logger.info(f"Processing resume from {simple_resume_path}...")
         
         try:
             # Load the simple resume
             with open(simple_resume_path, 'r') as file:
-                simple_resume = yaml.safe_load(file)
+                simple_resume = yaml.load(file, Loader=_Loader)
             
             # Create a deep copy to modify for the modular resume
             modular_resume = copy.deepcopy(simple_resume)
             
-            # Count total work experiences and projects to process
-            total_work_exps = len(modular_resume.get("work", []))
-            total_projects = len(modular_resume.get("projects", []))
-            total_items = total_work_exps + total_projects
-            current_item = 0
+            # Collect every work experience and project with bullet points to convert
+            sections = []
+            for work_exp in modular_resume.get("work", []):
+                company_name = work_exp.get('company', 'Unknown')
+                if isinstance(company_name, list):
+                    company_name = company_name[0]
+                sections.append((work_exp, f"work experience: {company_name}"))
+            for project in modular_resume.get("projects", []):
+                sections.append((project, f"project: {project.get('name', 'Unknown')}"))
+            
+            completed = 0
+            fully_converted = True
             
             # Keep track of the global sentence counter for sequential IDs
             sentence_counter = 1
             
-            # Process all work experiences
-            for i, work_exp in enumerate(modular_resume.get("work", [])):
-                current_item += 1
-                company_name = work_exp.get('company', 'Unknown')
-                if isinstance(company_name, list):
-                    company_name = company_name[0]
-                self.progress_update(current_item, total_items, f"Processing work experience: {company_name}")
+            async def process_section(section: Dict[str, Any], label: str, first_id: int) -> None:
+                nonlocal completed, fully_converted
+                resp_and_accom = section["responsibilities_and_accomplishments"]
                 
-                # Process responsibilities and accomplishments
-                resp_and_accom = work_exp.get("responsibilities_and_accomplishments", [])
-                if isinstance(resp_and_accom, list):
-                    new_resp_and_accom = {}
-                    
-                    # Create tasks for concurrent processing
-                    tasks = []
-                    for j, bullet in enumerate(resp_and_accom):
-                        # Use the global counter for ID generation
-                        tasks.append(self.run(bullet, sentence_counter))
-                        sentence_counter += 1
-                    
-                    # Process all bullets concurrently
-                    results = await asyncio.gather(*tasks)
-                    
-                    # Assign results to the appropriate group
-                    for j, result in enumerate(results):
-                        group_key = f"group_{j+1}"
-                        new_resp_and_accom[group_key] = result
-                    
-                    work_exp["responsibilities_and_accomplishments"] = new_resp_and_accom
-            
-            # Process projects if they exist
-            for i, project in enumerate(modular_resume.get("projects", [])):
-                current_item += 1
-                project_name = project.get('name', 'Unknown')
-                self.progress_update(current_item, total_items, f"Processing project: {project_name}")
+                # Process all bullets of this section concurrently
+                results = await asyncio.gather(*(
+                    self._run_with_status(bullet, first_id + j, use_cache) for j, bullet in enumerate(resp_and_accom)
+                ))
+                
+                # Assign results to the appropriate group
+                section["responsibilities_and_accomplishments"] = {
+                    f"group_{j+1}": result for j, (result, _) in enumerate(results)
+                }
+                if not all(converted for _, converted in results):
+                    fully_converted = False
                 
-                resp_and_accom = project.get("responsibilities_and_accomplishments", [])
+                completed += 1
+                self.progress_update(completed, total_items, f"Processed {label}", progress_step)
+            
+            # Create tasks for all sections up front so every bullet is converted concurrently
+            tasks = []
+            for section, label in sections:
+                resp_and_accom = section.get("responsibilities_and_accomplishments", [])
                 if isinstance(resp_and_accom, list):
-                    new_resp_and_accom = {}
-                    
-                    # Create tasks for concurrent processing
-                    tasks = []
-                    for j, bullet in enumerate(resp_and_accom):
-                        # Use the global counter for ID generation
-                        tasks.append(self.run(bullet, sentence_counter))
-                        sentence_counter += 1
-                    
-                    # Process all bullets concurrently
-                    results = await asyncio.gather(*tasks)
-                    
-                    # Assign results to the appropriate group
-                    for j, result in enumerate(results):
-                        group_key = f"group_{j+1}"
-                        new_resp_and_accom[group_key] = result
-                    
-                    project["responsibilities_and_accomplishments"] = new_resp_and_accom
+                    # Use the global counter for ID generation
+                    tasks.append(process_section(section, label, sentence_counter))
+                    sentence_counter += len(resp_and_accom)
+            
+            total_items = len(tasks)
+            progress_step = max(1, total_items // 4)
+            await asyncio.gather(*tasks)
             
             self.logger.info("Resume processing complete")
-            return modular_resume
+            return modular_resume, fully_converted
             
         except Exception as e:
             self.logger.error(f"Error processing resume: {e}")
-            return None
+            return None, False
     
     def save_modular_resume(self, modular_resume: Dict[str, Any], output_path: str) -> bool:
         """
@@ -309,15 +395,48 @@ class ResumeModularizer(Agent):
             
         try:
             # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        except OSError as e:
+            self.logger.error(f"Error saving modular resume: {e}")
+            return False
+        
+        # Write through the same code path as save_modular_resume_fd so both produce identical output
+        try:
+            result = self.save_modular_resume_fd(modular_resume, fd)
+        finally:
+            os.close(fd)
+        
+        if result:
+            self.logger.info(f"Modular resume saved to {output_path}")
+        return result
+    
+    def save_modular_resume_fd(self, modular_resume: Dict[str, Any], fd: int) -> bool:
+        """
+        Save the modular resume to an already open file descriptor.
+        The descriptor is left open; the caller is responsible for closing it.
+        
+        Args:
+            modular_resume (Dict[str, Any]): The modular resume structure
+            fd (int): File descriptor open for writing
             
-            # Save the modular resume
-            with open(output_path, 'w') as file:
-                yaml.dump(modular_resume, file, default_flow_style=False, sort_keys=False)
+        Returns:
+            bool: True if the save was successful, False otherwise
+        """
+        if not modular_resume:
+            self.logger.error("No modular resume to save.")
+            return False
             
-            self.logger.info(f"Modular resume saved to {output_path}")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', buffering=1 << 20, closefd=False) as file:
+                yaml.dump(modular_resume, file, Dumper=_Dumper, default_flow_style=False, sort_keys=False,
+                          width=_NO_LINE_WRAP, allow_unicode=True)
+            
+            self.logger.debug(f"Modular resume saved to file descriptor {fd}")
             return True
             
         except Exception as e:
             self.logger.error(f"Error saving modular resume: {e}")
-            return False 
\ No newline at end of file
+            return False
@@ -92,20 +92,31 @@ def test_role_selector(resume_data: Dict[str, Any], job_description: str) -> Lis
     
     return selected_roles
 
-def test_group_selector(resume_data: Dict[str, Any], selected_roles: List[int], job_description: str) -> Dict[int, List[str]]:
+async def test_group_selector(resume_data: Dict[str, Any], selected_roles: List[int], job_description: str) -> Dict[int, List[str]]:
     """Test the GroupSelector agent."""
     print("\n=== Testing GroupSelector ===")
     
     agent = GroupSelector()
     all_selected_groups = {}
+    projects = resume_data.get("projects") or []
+    
+    # GroupSelector is synchronous, so run all selections concurrently in the default executor
+    loop = asyncio.get_running_loop()
+    role_selections, project_selections = await asyncio.gather(
+        asyncio.gather(*[
+            loop.run_in_executor(None, agent.run, resume_data["work"][role_idx]["responsibilities_and_accomplishments"], job_description)
+            for role_idx in selected_roles
+        ]),
+        asyncio.gather(*[
+            loop.run_in_executor(None, agent.run, project["responsibilities_and_accomplishments"], job_description)
+            for project in projects
+        ])
+    )
     
-    for role_idx in selected_roles:
+    for role_idx, selected_groups in zip(selected_roles, role_selections):
         role = resume_data["work"][role_idx]
         
         print(f"\nSelecting groups for role {role_idx} ({role['title_variables'][0]}):")
-        
-        selected_groups = agent.run(role["responsibilities_and_accomplishments"], job_description)
-        
         print(f"Selected groups: {selected_groups}")
         
         # Print original sentences for selected groups
@@ -116,14 +127,11 @@ def test_group_selector(resume_data: Dict[str, Any], selected_roles: List[int],
         all_selected_groups[role_idx] = selected_groups
     
     # Test group selection for projects if they exist
-    if "projects" in resume_data and resume_data["projects"]:
+    if projects:
         print("\nSelecting groups for projects:")
         
-        for project_idx, project in enumerate(resume_data["projects"]):
+        for project_idx, (project, selected_groups) in enumerate(zip(projects, project_selections)):
             print(f"\nProject {project_idx} ({project['name']}):")
-            
-            selected_groups = agent.run(project["responsibilities_and_accomplishments"], job_description)
-            
             print(f"Selected groups: {selected_groups}")
             
             # Print original sentences for selected groups
@@ -179,17 +187,35 @@ async def test_sentence_constructor(resume_data: Dict[str, Any], selected_roles:
         print("\nPlanning action verbs for all sentences...")
         agent.plan_action_verbs(all_group_data, job_description)
     
+    # Construct every selected sentence concurrently
+    role_groups = [(role_idx, all_selected_groups[role_idx]) for role_idx in selected_roles]
+    project_groups = []
+    if "projects" in resume_data and resume_data["projects"]:
+        project_groups = [
+            (project_idx, all_selected_groups[f"project_{project_idx}"])
+            for project_idx in range(len(resume_data["projects"]))
+            if f"project_{project_idx}" in all_selected_groups
+        ]
+    
+    tasks = []
+    for role_idx, group_names in role_groups:
+        responsibilities = resume_data["work"][role_idx]["responsibilities_and_accomplishments"]
+        tasks.extend(agent.run(responsibilities[group_name], job_description) for group_name in group_names)
+    for project_idx, group_names in project_groups:
+        responsibilities = resume_data["projects"][project_idx]["responsibilities_and_accomplishments"]
+        tasks.extend(agent.run(responsibilities[group_name], job_description) for group_name in group_names)
+    
+    results = iter(await asyncio.gather(*tasks))
+    
     # Process roles
-    for role_idx in selected_roles:
+    for role_idx, group_names in role_groups:
         role = resume_data["work"][role_idx]
         role_sentences = {}
         
         print(f"\nConstructing sentences for role {role_idx} ({role['title_variables'][0]}):")
         
-        for group_name in all_selected_groups[role_idx]:
-            group_data = role["responsibilities_and_accomplishments"][group_name]
-            
-            constructed_sentence = await agent.run(group_data, job_description)
+        for group_name in group_names:
+            constructed_sentence = next(results)
             
             print(f"- {group_name}: {constructed_sentence}")
             
@@ -209,25 +235,23 @@ async def test_sentence_constructor(resume_data: Dict[str, Any], selected_roles:
     if "projects" in resume_data and resume_data["projects"]:
         project_sentences = {}
         
-        for project_idx, project in enumerate(resume_data["projects"]):
-            if f"project_{project_idx}" in all_selected_groups:
-                print(f"\nConstructing sentences for project {project_idx} ({project['name']}):")
-                
-                project_role_sentences = {}
+        for project_idx, group_names in project_groups:
+            project = resume_data["projects"][project_idx]
+            print(f"\nConstructing sentences for project {project_idx} ({project['name']}):")
+            
+            project_role_sentences = {}
+            
+            for group_name in group_names:
+                constructed_sentence = next(results)
                 
-                for group_name in all_selected_groups[f"project_{project_idx}"]:
-                    group_data = project["responsibilities_and_accomplishments"][group_name]
-                    
-                    constructed_sentence = await agent.run(group_data, job_description)
-                    
-                    print(f"- {group_name}: {constructed_sentence}")
-                    
-                    project_role_sentences[group_name] = constructed_sentence
+                print(f"- {group_name}: {constructed_sentence}")
                 
-                project_sentences[project_idx] = {
-                    "name": project["name"],
-                    "sentences": project_role_sentences
-                }
+                project_role_sentences[group_name] = constructed_sentence
+            
+            project_sentences[project_idx] = {
+                "name": project["name"],
+                "sentences": project_role_sentences
+            }
         
         constructed_sentences["projects"] = project_sentences
     
@@ -240,49 +264,45 @@ async def test_sentence_reviewer(constructed_sentences: Dict[int, Dict[str, Any]
     agent = SentenceReviewer()
     review_results = {}
     
-    # Review work experience sentences
-    for role_idx, role_data in constructed_sentences.items():
-        if role_idx != "projects": # Skip the projects key
-            print(f"\nReviewing sentences for role {role_idx} ({role_data['title']}):")
+    # Review every sentence concurrently
+    role_items = [(role_idx, role_data) for role_idx, role_data in constructed_sentences.items() if role_idx != "projects"]
+    project_items = list(constructed_sentences.get("projects", {}).items())
+    
+    tasks = [
+        agent.run(sentence)
+        for _, data in role_items + project_items
+        for sentence in data["sentences"].values()
+    ]
+    results = iter(await asyncio.gather(*tasks))
+    
+    def collect_reviews(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        reviews = {}
+        for group_name in data["sentences"]:
+            is_approved, feedback = next(results)
             
-            role_reviews = {}
-            for group_name, sentence in role_data["sentences"].items():
-                is_approved, feedback = await agent.run(sentence)
-                
-                status = "✅ Approved" if is_approved else "❌ Rejected"
-                print(f"- {group_name}: {status}")
-                if not is_approved:
-                    print(f"  Feedback: {feedback}")
-                
-                role_reviews[group_name] = {
-                    "approved": is_approved,
-                    "feedback": feedback
-                }
+            status = "✅ Approved" if is_approved else "❌ Rejected"
+            print(f"- {group_name}: {status}")
+            if not is_approved:
+                print(f"  Feedback: {feedback}")
             
-            review_results[role_idx] = role_reviews
+            reviews[group_name] = {
+                "approved": is_approved,
+                "feedback": feedback
+            }
+        return reviews
+    
+    # Review work experience sentences
+    for role_idx, role_data in role_items:
+        print(f"\nReviewing sentences for role {role_idx} ({role_data['title']}):")
+        review_results[role_idx] = collect_reviews(role_data)
     
     # Review project sentences if they exist
     if "projects" in constructed_sentences:
         project_reviews = {}
         
-        for project_idx, project_data in constructed_sentences["projects"].items():
+        for project_idx, project_data in project_items:
             print(f"\nReviewing sentences for project {project_idx} ({project_data['name']}):")
-            
-            project_role_reviews = {}
-            for group_name, sentence in project_data["sentences"].items():
-                is_approved, feedback = await agent.run(sentence)
-                
-                status = "✅ Approved" if is_approved else "❌ Rejected"
-                print(f"- {group_name}: {status}")
-                if not is_approved:
-                    print(f"  Feedback: {feedback}")
-                
-                project_role_reviews[group_name] = {
-                    "approved": is_approved,
-                    "feedback": feedback
-                }
-            
-            project_reviews[project_idx] = project_role_reviews
+            project_reviews[project_idx] = collect_reviews(project_data)
         
         review_results["projects"] = project_reviews
     
@@ -411,7 +431,7 @@ async def main():
     # Using the enriched job description for subsequent tests
     selected_roles = test_role_selector(resume_data, enriched_description)
     
-    all_selected_groups = test_group_selector(resume_data, selected_roles, enriched_description)
+    all_selected_groups = await test_group_selector(resume_data, selected_roles, enriched_description)
     
     selected_titles = await test_title_selector(resume_data, selected_roles, enriched_description)
     
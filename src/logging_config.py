@@ -11,6 +11,7 @@ import logging
 from logging.handlers import RotatingFileHandler
 from datetime import datetime
 import inspect
+from contextlib import asynccontextmanager
 
 # Make sure the logs directory exists
 logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
@@ -101,6 +102,15 @@ def log_async_complete(logger, func_name):
     """Log the completion of an async function execution with proper formatting"""
     logger.debug(f"Completed async function: {func_name}")
 
+@asynccontextmanager
+async def log_async_phase(logger, func_name):
+    """Log the start and completion of an async block, including when it exits early or raises"""
+    log_async_start(logger, func_name)
+    try:
+        yield
+    finally:
+        log_async_complete(logger, func_name)
+
 # Export needed functions
 __all__ = ['configure_logging', 'get_logger', 'get_class_logger', 
-           'log_async_start', 'log_async_complete', 'logger'] 
\ No newline at end of file
+           'log_async_start', 'log_async_complete', 'log_async_phase', 'logger'] 
\ No newline at end of file
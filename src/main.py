@@ -1,57 +1,47 @@
 #!/usr/bin/env python3
 import argparse
-import yaml
 import os
 import json
 import sys
 import asyncio
-from typing import Dict, List, Any
-import subprocess
+from typing import Dict, List, Any, Optional
 
 # Add the src directory to the path if not already there
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
+# Project directories, resolved once at import
+PROJECT_ROOT = os.path.dirname(current_dir)
+INPUT_DIR = os.environ.get("ARC_INPUT_DIR") or os.path.join(PROJECT_ROOT, "input")
+OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
+
 # Import config to ensure environment variables are loaded
 try:
     # Try relative import (when used as a module)
     from .config import load_dotenv
     from .logging_config import get_logger, log_async_start, log_async_complete
-    from .agents import (
-        Agent,
-        CompanyResearcher,
-        RoleSelector,
-        GroupSelector,
-        SentenceConstructor,
-        SentenceReviewer,
-        ContentReviewer,
-        SummaryGenerator,
-        TitleSelector
-    )
 except ImportError:
     # Fall back to absolute import (when run as a script)
     from config import load_dotenv
     from logging_config import get_logger, log_async_start, log_async_complete
-    from agents import (
-        Agent,
-        CompanyResearcher,
-        RoleSelector,
-        GroupSelector,
-        SentenceConstructor,
-        SentenceReviewer,
-        ContentReviewer,
-        SummaryGenerator,
-        TitleSelector
-    )
 
 # Get logger for this module
 logger = get_logger()
 
+async def _indexed(index, coro):
+    """Await a coroutine and return its result paired with the given index."""
+    return index, await coro
+
 class ResumeCustomizer:
     """Orchestrates the resume customization workflow using multiple agents."""
     
-    def __init__(self, resume_path: str, job_description_path: str, output_path: str):
+    # Maximum construct/review attempts per sentence
+    MAX_SENTENCE_ATTEMPTS = 3
+    # Maximum number of sentences reconstructing in parallel
+    MAX_CONCURRENT_RETRIES = 8
+    
+    def __init__(self, resume_path: str, job_description_path: str, output_path: str, load_inputs: bool = True):
         """
         Initialize the resume customizer with paths to the resume, job description, and output file.
         
@@ -59,6 +49,8 @@ class ResumeCustomizer:
             resume_path (str): Path to the resume file (YAML)
             job_description_path (str): Path to the job description file (TXT)
             output_path (str): Path to save the customized resume
+            load_inputs (bool): Whether to load the resume and job description immediately.
+                Use the create() factory to load them asynchronously instead.
         """
         # Set up logger
         self.logger = get_logger(self.__class__.__name__)
@@ -70,8 +62,32 @@ class ResumeCustomizer:
         
         # Load resume and job description
         self.state = {}
-        self._load_resume()
-        self._load_job_description()
+        if load_inputs:
+            self._load_resume()
+            self._load_job_description()
+            self._init_state()
+        
+        # Import agents here so admin-only commands don't pay for loading them
+        try:
+            from .agents import (
+                CompanyResearcher,
+                GroupSelector,
+                SentenceConstructor,
+                SentenceReviewer,
+                ContentReviewer,
+                SummaryGenerator,
+                TitleSelector
+            )
+        except ImportError:
+            from agents import (
+                CompanyResearcher,
+                GroupSelector,
+                SentenceConstructor,
+                SentenceReviewer,
+                ContentReviewer,
+                SummaryGenerator,
+                TitleSelector
+            )
         
         # Initialize agents
         self.company_researcher = CompanyResearcher()
@@ -81,19 +97,55 @@ class ResumeCustomizer:
         self.content_reviewer = ContentReviewer()
         self.summary_generator = SummaryGenerator()
         self.title_selector = TitleSelector()
+
+    def workflow_step(self, step_num: int, total_steps: int, message: str):
+        """
+        Log a major workflow step with step number and total steps.
         
-        # Add workflow step method from Agent base class
-        self.workflow_step = lambda step_num, total_steps, message: self.logger.info(f"[{step_num}/{total_steps}] {message}")
-        self.progress_update = lambda current, total, operation: self.logger.info(f"{operation}... ({current}/{total} complete)") if current == 1 or current == total or current % max(1, (total // 4)) == 0 else self.logger.debug(f"{operation}... ({current}/{total} complete)")
+        Args:
+            step_num (int): Current step number
+            total_steps (int): Total number of steps
+            message (str): Description of the current step
+        """
+        self.logger.info("[%d/%d] %s", step_num, total_steps, message)
     
     def _load_resume(self):
-        with open(self.resume_path, 'r') as f:
-            self.resume_data = yaml.safe_load(f)
+        import yaml
+        
+        # Prefer the libyaml-backed loader when available
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(self.resume_path, 'r', encoding='utf-8') as f:
+            self.resume_data = yaml.load(f, Loader=loader)
+    
+    @classmethod
+    async def create(cls, resume_path: str, job_description_path: str, output_path: str) -> "ResumeCustomizer":
+        """
+        Create a resume customizer, reading the resume and job description in parallel.
+        
+        Args:
+            resume_path (str): Path to the resume file (YAML)
+            job_description_path (str): Path to the job description file (TXT)
+            output_path (str): Path to save the customized resume
+            
+        Returns:
+            ResumeCustomizer: A customizer ready to run
+        """
+        customizer = cls(resume_path, job_description_path, output_path, load_inputs=False)
+        
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            loop.run_in_executor(None, customizer._load_resume),
+            loop.run_in_executor(None, customizer._load_job_description)
+        )
+        customizer._init_state()
+        
+        return customizer
     
     def _load_job_description(self):
         with open(self.job_description_path, 'r') as f:
             self.job_description = f.read()
-        
+    
+    def _init_state(self):
         # Initialize the state for the workflow
         self.state = {
             "resume_data": self.resume_data,
@@ -107,8 +159,38 @@ class ResumeCustomizer:
     
     async def run(self):
         """Run the resume customization workflow."""
+        import aiohttp
+        
+        # Share one connection pool across all agents for the whole run
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=30)
+        )
+        agents = [
+            self.company_researcher,
+            self.group_selector,
+            self.sentence_constructor,
+            self.sentence_reviewer,
+            self.content_reviewer,
+            self.summary_generator,
+            self.title_selector
+        ]
+        for agent in agents:
+            agent.http_session = http_session
+        
+        try:
+            return await self._run_workflow()
+        finally:
+            await http_session.close()
+            for agent in agents:
+                agent.http_session = None
+    
+    async def _run_workflow(self):
+        """Run each step of the resume customization workflow."""
         log_async_start(self.logger, "run")
         
+        # Created here so the semaphore is bound to the running event loop
+        self.retry_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_RETRIES)
+        
         total_steps = 6
         
         # Step 1: Enrich job description
@@ -123,12 +205,21 @@ class ResumeCustomizer:
         self.state["selected_role_groups"] = {}
         self.state["selected_project_groups"] = {}
         
+        # Group selection uses blocking HTTP calls, so run it in the default executor
+        loop = asyncio.get_running_loop()
+        
         # Select groups for work experiences
-        for role_index, role in enumerate(self.state["resume_data"]["work"]):
-            selected_role_groups = self.group_selector.run(
+        roles = self.state["resume_data"]["work"]
+        role_selections = await asyncio.gather(*[
+            loop.run_in_executor(
+                None,
+                self.group_selector.run,
                 role["responsibilities_and_accomplishments"],
                 self.state["enriched_job_description"]
             )
+            for role in roles
+        ])
+        for role_index, (role, selected_role_groups) in enumerate(zip(roles, role_selections)):
             self.state["selected_role_groups"][role_index] = selected_role_groups
             for group_name in selected_role_groups:
                 group_data = role["responsibilities_and_accomplishments"][group_name]
@@ -136,11 +227,17 @@ class ResumeCustomizer:
         
         # Select groups for projects if they exist
         if "projects" in self.state["resume_data"] and self.state["resume_data"]["projects"]:
-            for project_index, project in enumerate(self.state["resume_data"]["projects"]):
-                selected_project_groups = self.group_selector.run(
+            projects = self.state["resume_data"]["projects"]
+            project_selections = await asyncio.gather(*[
+                loop.run_in_executor(
+                    None,
+                    self.group_selector.run,
                     project["responsibilities_and_accomplishments"],
                     self.state["enriched_job_description"]
                 )
+                for project in projects
+            ])
+            for project_index, (project, selected_project_groups) in enumerate(zip(projects, project_selections)):
                 self.state["selected_project_groups"][project_index] = selected_project_groups
                 for group_name in selected_project_groups:
                     group_data = project["responsibilities_and_accomplishments"][group_name]
@@ -157,17 +254,19 @@ class ResumeCustomizer:
         # Process all roles concurrently
         role_tasks = []
         for role_index in range(len(self.state["resume_data"]["work"])):
-            role_tasks.append(self._process_role(role_index))
+            role_tasks.append(_indexed(role_index, self._process_role(role_index)))
         
         # Log progress for roles
         total_items = len(role_tasks)
         self.logger.info(f"Processing {total_items} work experiences...")
         
-        role_results = await asyncio.gather(*role_tasks)
-        
-        # Add role results to state
-        for role_index, role_data in enumerate(role_results):
+        # Add role results to state as soon as each one finishes
+        for future in asyncio.as_completed(role_tasks):
+            role_index, role_data = await future
             self.state["constructed_sentences"][role_index] = role_data
+        
+        # Restore resume order for the summary and review steps
+        self.state["constructed_sentences"] = dict(sorted(self.state["constructed_sentences"].items()))
             
         # Step 3: Process projects if they exist
         self.workflow_step(3, total_steps, "Processing projects")
@@ -177,30 +276,36 @@ class ResumeCustomizer:
             # Process all projects concurrently
             project_tasks = []
             for project_index in range(len(self.state["resume_data"]["projects"])):
-                project_tasks.append(self._process_project(project_index))
+                project_tasks.append(_indexed(project_index, self._process_project(project_index)))
             
             # Log progress for projects
             total_projects = len(project_tasks)
             self.logger.info(f"Processing {total_projects} projects...")
             
-            project_results = await asyncio.gather(*project_tasks)
-            
-            # Add project results to state
-            for project_index, project_data in enumerate(project_results):
+            # Add project results to state as soon as each one finishes
+            for future in asyncio.as_completed(project_tasks):
+                project_index, project_data = await future
                 self.state["constructed_project_sentences"][project_index] = project_data
+            
+            # Restore resume order for assembly
+            self.state["constructed_project_sentences"] = dict(sorted(self.state["constructed_project_sentences"].items()))
         else:
             self.logger.info("No projects to process")
         
         # Step 4: Review overall content for relevance and narrative
         self.workflow_step(4, total_steps, "Reviewing overall resume content")
-        self.state["content_review"] = self.content_reviewer.run(
+        self.state["content_review"] = await loop.run_in_executor(
+            None,
+            self.content_reviewer.run,
             self.state["constructed_sentences"],
             self.state["enriched_job_description"]
         )
         
         # Step 5: Generate resume summary
         self.workflow_step(5, total_steps, "Generating tailored resume summary")
-        self.state["resume_summary"] = self.summary_generator.run(
+        self.state["resume_summary"] = await loop.run_in_executor(
+            None,
+            self.summary_generator.run,
             self.state["constructed_sentences"],
             self.state["enriched_job_description"]
         )
@@ -289,27 +394,39 @@ class ResumeCustomizer:
         # Step 2: Review sentence
         is_approved, feedback = await self.sentence_reviewer.run(constructed_sentence)
         
-        # If not approved, reconstruct the sentence
-        attempts = 1
-        while not is_approved and attempts < 3:
-            self.logger.debug(f"Reconstructing sentence (attempt {attempts+1}/3)")
-            constructed_sentence = await self.sentence_constructor.run(
-                group_data, 
-                self.state["enriched_job_description"],
-                feedback=feedback,
-                # Don't need to pass action verbs again as they're now stored in the SentenceConstructor
-                planned_action_verbs=None
-            )
-            is_approved, feedback = await self.sentence_reviewer.run(constructed_sentence)
-            attempts += 1
+        # If not approved, speculatively reconstruct the remaining attempts in parallel
+        # and keep the first approved candidate
+        if not is_approved:
+            retries = self.MAX_SENTENCE_ATTEMPTS - 1
+            self.logger.debug(f"Reconstructing sentence ({retries} parallel attempts)")
+            async with self.retry_semaphore:
+                candidates = await asyncio.gather(*[
+                    self._reconstruct_sentence(group_data, feedback)
+                    for _ in range(retries)
+                ])
+            for constructed_sentence, is_approved, feedback in candidates:
+                if is_approved:
+                    break
         
         if not is_approved:
             # Include the sentence even if not approved after 3 attempts
-            self.logger.warning(f"Using imperfect sentence after 3 attempts: {feedback}")
+            self.logger.warning(f"Using imperfect sentence after {self.MAX_SENTENCE_ATTEMPTS} attempts: {feedback}")
         
         log_async_complete(self.logger, func_name)
         return constructed_sentence
     
+    async def _reconstruct_sentence(self, group_data, feedback):
+        """Reconstruct a rejected sentence using reviewer feedback and review the result."""
+        constructed_sentence = await self.sentence_constructor.run(
+            group_data, 
+            self.state["enriched_job_description"],
+            feedback=feedback,
+            # Don't need to pass action verbs again as they're now stored in the SentenceConstructor
+            planned_action_verbs=None
+        )
+        is_approved, feedback = await self.sentence_reviewer.run(constructed_sentence)
+        return constructed_sentence, is_approved, feedback
+    
     async def _process_project(self, project_index):
         """Process a single project concurrently."""
         func_name = f"_process_project({project_index})"
@@ -348,8 +465,11 @@ class ResumeCustomizer:
         """Create the final Markdown resume from the processed data."""
         basics = self.state["resume_data"]["basics"]
         
+        # Collect the pieces and join once at the end
+        parts = []
+        
         # Start with the resume header
-        markdown = f"# {basics['name']}\n\n"
+        parts.append(f"# {basics['name']}\n\n")
         
         # Contact information
         contact_info = []
@@ -362,14 +482,14 @@ class ResumeCustomizer:
         if "linkedin" in basics:
             contact_info.append(f"[LinkedIn]({basics['linkedin']})")
             
-        markdown += " | ".join(contact_info) + "\n\n"
+        parts.append(" | ".join(contact_info) + "\n\n")
         
         # Summary
-        markdown += "## Summary\n\n"
-        markdown += self.state["resume_summary"] + "\n\n"
+        parts.append("## Summary\n\n")
+        parts.append(self.state["resume_summary"] + "\n\n")
         
         # Experience
-        markdown += "## Experience\n\n"
+        parts.append("## Experience\n\n")
         
         # Sort roles by start_date (assuming format like "Mar 2023")
         sorted_roles = sorted(
@@ -379,41 +499,41 @@ class ResumeCustomizer:
         )
         
         for role in sorted_roles:
-            markdown += f"### {role['title']} | {role['company']}\n"
-            markdown += f"*{role['start_date']} - {role['end_date']}* | {role['location']}\n\n"
+            parts.append(f"### {role['title']} | {role['company']}\n")
+            parts.append(f"*{role['start_date']} - {role['end_date']}* | {role['location']}\n\n")
             
             # Add bullet points for each sentence
             for group_name, sentence in role["sentences"].items():
-                markdown += f"- {sentence}\n"
+                parts.append(f"- {sentence}\n")
             
-            markdown += "\n"
+            parts.append("\n")
         
         # Projects (if any)
         if self.state["constructed_project_sentences"]:
-            markdown += "## Projects\n\n"
+            parts.append("## Projects\n\n")
             
             for project_data in self.state["constructed_project_sentences"].values():
-                markdown += f"### {project_data['name']}\n\n"
+                parts.append(f"### {project_data['name']}\n\n")
                 
                 # Add bullet points for each sentence
                 for group_name, sentence in project_data["sentences"].items():
-                    markdown += f"- {sentence}\n"
+                    parts.append(f"- {sentence}\n")
                 
-                markdown += "\n"
+                parts.append("\n")
 
         # Education
-        markdown += "## Education\n\n"
+        parts.append("## Education\n\n")
         for education in self.state["resume_data"]["education"]:
-            markdown += f"### {education['institution']} | {education['degree']} | {education['field_of_study']}\n"
-            markdown += f"*{education['year_of_completion']}*\n\n"
+            parts.append(f"### {education['institution']} | {education['degree']} | {education['field_of_study']}\n")
+            parts.append(f"*{education['year_of_completion']}*\n\n")
         
         # Certificates
-        markdown += "## Certificates\n\n"
+        parts.append("## Certificates\n\n")
         for certificate in self.state["resume_data"]["certificates"]:
-            markdown += f"### {certificate['name']} | {certificate['organization']}\n"
-            markdown += f"*{certificate['date_of_issue']}*\n\n"
+            parts.append(f"### {certificate['name']} | {certificate['organization']}\n")
+            parts.append(f"*{certificate['date_of_issue']}*\n\n")
         
-        return markdown
+        return "".join(parts)
     
     def _parse_date(self, date_str: str) -> tuple:
         """Simple date parser to help with sorting. Returns a tuple of (year, month_index)."""
@@ -428,30 +548,40 @@ class ResumeCustomizer:
         return (0, 0)  # Default for unparseable dates
 
 
-async def check_and_create_modular_resume():
+async def check_and_create_modular_resume(resume_exists: Optional[bool] = None):
     """
     Check if resume.yaml exists, and run the modularizer if needed.
     
+    Args:
+        resume_exists (Optional[bool]): Whether resume.yaml is already known to exist.
+            If None, the file system is checked.
+    
     Returns:
         bool: True if resume.yaml exists or was created, False otherwise
     """
     log_async_start(logger, "check_and_create_modular_resume")
     
-    input_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "input")
-    resume_path = os.path.join(input_dir, "resume.yaml")
+    resume_path = os.path.join(INPUT_DIR, "resume.yaml")
     
-    if os.path.isfile(resume_path):
+    if resume_exists is None:
+        resume_exists = os.path.isfile(resume_path)
+    
+    if resume_exists:
         log_async_complete(logger, "check_and_create_modular_resume")
         return True
     
     logger.info("No modular resume file (resume.yaml) found.")
     logger.info("Running resume modularizer to create one...")
     
-    # Run modularize_resume.py
-    modularizer_path = os.path.join(os.path.dirname(__file__), "modularize_resume.py")
+    # Run the modularizer in-process rather than spawning a new interpreter
+    try:
+        from .modularize_resume import main_async as modularize_main_async
+    except ImportError:
+        from modularize_resume import main_async as modularize_main_async
     
     try:
-        subprocess.run([sys.executable, modularizer_path], check=True)
+        # Pass an empty argv so the modularizer doesn't parse this script's arguments
+        await modularize_main_async([])
         
         # Check if resume.yaml was created
         if os.path.isfile(resume_path):
@@ -461,7 +591,7 @@ async def check_and_create_modular_resume():
             logger.error("Failed to create modular resume file.")
             log_async_complete(logger, "check_and_create_modular_resume")
             return False
-    except subprocess.SubprocessError as e:
+    except Exception as e:
         logger.error(f"Error running resume modularizer: {e}")
         log_async_complete(logger, "check_and_create_modular_resume")
         return False
@@ -501,24 +631,21 @@ async def async_main():
             log_async_complete(logger, "async_main")
             return
     
-    # Get the resume file
-    if args.resume:
-        resume_path = args.resume
-    else:
-        input_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "input")
-        resume_path = os.path.join(input_dir, "resume.yaml")
-        
-        # Check if resume.yaml needs to be created
-        if not args.skip_modularizer and not os.path.isfile(resume_path):
-            success = await check_and_create_modular_resume()
-            if not success:
-                logger.error("Could not find or create a modular resume file.")
-                logger.error("Please provide a valid resume file with --resume or create one manually.")
-                log_async_complete(logger, "async_main")
-                return
+    # Get the resume file and check it once
+    resume_path = args.resume if args.resume else os.path.join(INPUT_DIR, "resume.yaml")
+    resume_exists = os.path.isfile(resume_path)
+    
+    # Check if resume.yaml needs to be created
+    if not args.resume and not args.skip_modularizer and not resume_exists:
+        resume_exists = await check_and_create_modular_resume(resume_exists)
+        if not resume_exists:
+            logger.error("Could not find or create a modular resume file.")
+            logger.error("Please provide a valid resume file with --resume or create one manually.")
+            log_async_complete(logger, "async_main")
+            return
     
     # Check if the resume file exists
-    if not os.path.isfile(resume_path):
+    if not resume_exists:
         logger.error(f"Resume file not found: {resume_path}")
         logger.error("Please provide a valid resume file with --resume.")
         log_async_complete(logger, "async_main")
@@ -528,8 +655,7 @@ async def async_main():
     if args.job_description:
         job_description_path = args.job_description
     else:
-        input_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "input")
-        job_description_path = os.path.join(input_dir, "job_description.txt")
+        job_description_path = os.path.join(INPUT_DIR, "job_description.txt")
     
     # Check if the job description file exists
     if not os.path.isfile(job_description_path):
@@ -542,12 +668,11 @@ async def async_main():
     if args.output:
         output_path = args.output
     else:
-        output_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "output")
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.join(output_dir, "customized_resume.md")
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        output_path = os.path.join(OUTPUT_DIR, "customized_resume.md")
     
     # Create the resume customizer and run it
-    customizer = ResumeCustomizer(resume_path, job_description_path, output_path)
+    customizer = await ResumeCustomizer.create(resume_path, job_description_path, output_path)
     await customizer.run()
     
     log_async_complete(logger, "async_main")
@@ -8,24 +8,137 @@ for different job applications.
 
 import os
 import sys
-import yaml
 import asyncio
-from typing import Optional
+import hashlib
+import shutil
+import signal
+import stat
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
 import argparse
+from dataclasses import dataclass
 
-try:
-    # Try relative import
-    from .logging_config import get_logger, log_async_start, log_async_complete
-    from .agents import ResumeModularizer
-except ImportError:
-    # Try absolute import
-    from logging_config import get_logger, log_async_start, log_async_complete
+if __package__:
+    # Imported as part of the package
+    from .logging_config import get_logger, log_async_phase
+else:
+    # Run as a script or imported from the src directory
+    from logging_config import get_logger, log_async_phase
+
+if TYPE_CHECKING:
     from agents import ResumeModularizer
 
+class _LazyLogger:
+    """
+    Proxy that looks up the module logger on first use, so paths that never log skip the lookup.
+    """
+    __slots__ = ("_logger",)
+    
+    def __init__(self):
+        self._logger = None
+    
+    def __getattr__(self, name):
+        if self._logger is None:
+            self._logger = get_logger(__name__)
+        return getattr(self._logger, name)
+
 # Get logger for this module
-logger = get_logger()
+logger = _LazyLogger()
+
+# Input directory and resume files, resolved once at import.
+# Defaults to <root>/input, assuming this file lives at <root>/src/modularize_resume.py;
+# set ARC_INPUT_DIR to use a different directory.
+_INPUT_DIR: Path = Path(os.environ.get("ARC_INPUT_DIR") or (Path(__file__).resolve().parents[1] / "input"))
+_SIMPLE_YAML: Path = _INPUT_DIR / "resume_simple.yaml"
+_MODULAR_YAML: Path = _INPUT_DIR / "resume.yaml"
 
-def get_input_path(prompt: str, default_path: Optional[str] = None) -> Optional[str]:
+# Modular resumes cached by the content hash of the simple resume they were created from
+_CACHE_DIR: Path = _INPUT_DIR / ".cache"
+_HASH_CHUNK_SIZE = 64 * 1024
+
+# Example resume_simple.yaml shown when no simple resume is found
+_TEMPLATE_BYTES = b"""
+basics:
+  name: "Your Name"
+  email: "your.email@example.com"
+  phone: "+1 123 456 7890"
+  location: 
+    city: "City"
+    province: "Province"
+    country: "Country"
+    address: "Your Address"
+    postal_code: "A1B 2C3"
+  linkedin: "https://linkedin.com/in/yourusername"
+  
+work:
+  - title_variables:
+      - "Job Title 1"
+      - "Alternative Job Title"
+    start_date: "Jan 2022"
+    end_date: "Present"
+    company:
+      - "Company Name"
+    location: "City, Province, Country"
+    responsibilities_and_accomplishments:
+      - "Your first bullet point describing a responsibility or accomplishment"
+      - "Your second bullet point describing another responsibility or accomplishment"
+
+education:
+  - institution: "University Name"
+    degree: "Your Degree"
+    field_of_study: "Your Field"
+    start_date: "2016"
+    year_of_completion: "2020"
+
+"""
+
+# Responses that accept a (Y/n) prompt, and those that accept a (y/N) prompt
+_YES = frozenset({"", "y", "yes"})
+_YES_EXPLICIT = frozenset({"y", "yes"})
+
+# Responses that cancel a file path prompt
+_CANCEL_WORDS = frozenset({"no", "n", "cancel", "quit", "exit"})
+
+def _file_stat(path: str) -> Optional[os.stat_result]:
+    """
+    Stat a path once, returning the result only if it is a regular file.
+    
+    Args:
+        path (str): Path to check
+        
+    Returns:
+        Optional[os.stat_result]: The stat result, or None if the path is not a regular file
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+async def ainput(prompt: str) -> str:
+    """
+    Read a line from stdin.
+    
+    The read stays on the main thread: nothing else needs the event loop while the user types,
+    and an executor thread blocked in input() would keep Ctrl-C from exiting until a line is entered.
+    The default SIGINT handler is restored for the duration of the read, since asyncio.run's handler
+    only cancels the main task, which cannot happen while input() blocks the loop.
+    
+    Args:
+        prompt (str): The prompt to display to the user
+        
+    Returns:
+        str: The line entered by the user
+    """
+    previous_handler = signal.getsignal(signal.SIGINT)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    try:
+        return input(prompt)
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+async def get_input_path(prompt: str, default_path: Optional[str] = None) -> Optional[str]:
     """
     Ask the user for an input file path.
     
@@ -37,20 +150,40 @@ def get_input_path(prompt: str, default_path: Optional[str] = None) -> Optional[
         Optional[str]: The file path or None if the user wants to cancel
     """
     default_msg = f" [{default_path}]" if default_path else ""
-    user_input = input(f"{prompt}{default_msg}: ").strip()
-    
-    if not user_input and default_path:
-        return default_path
-    
-    if user_input.lower() in ("no", "n", "cancel", "quit", "exit"):
-        return None
     
-    # Validate the file exists
-    if not os.path.isfile(user_input):
-        logger.error(f"File not found: {user_input}")
-        return get_input_path(prompt, default_path)
+    while True:
+        user_input = (await ainput(f"{prompt}{default_msg}: ")).strip()
+        
+        if not user_input and default_path:
+            return default_path
+        
+        if user_input.casefold() in _CANCEL_WORDS:
+            return None
+        
+        # Validate the file exists
+        if await asyncio.get_running_loop().run_in_executor(None, _file_stat, user_input) is not None:
+            return user_input
+        
+        logger.error("File not found: %s", user_input)
+
+@lru_cache(maxsize=1)
+def _scan_input_dir() -> Dict[str, bool]:
+    """
+    Record which resume files exist in the input directory using a single directory scan.
+    The result is cached until invalidate_cache() is called.
     
-    return user_input
+    Returns:
+        Dict[str, bool]: Mapping of resume file names to whether they exist
+    """
+    found = {_MODULAR_YAML.name: False, _SIMPLE_YAML.name: False}
+    try:
+        with os.scandir(_INPUT_DIR) as entries:
+            for entry in entries:
+                if entry.name in found and entry.is_file():
+                    found[entry.name] = True
+    except FileNotFoundError:
+        pass
+    return found
 
 def check_resume_yaml_exists() -> bool:
     """
@@ -59,8 +192,7 @@ def check_resume_yaml_exists() -> bool:
     Returns:
         bool: True if resume.yaml exists, False otherwise
     """
-    input_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "input")
-    return os.path.isfile(os.path.join(input_dir, "resume.yaml"))
+    return _scan_input_dir()[_MODULAR_YAML.name]
 
 def check_resume_simple_yaml_exists() -> bool:
     """
@@ -69,172 +201,325 @@ def check_resume_simple_yaml_exists() -> bool:
     Returns:
         bool: True if resume_simple.yaml exists, False otherwise
     """
-    input_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "input")
-    return os.path.isfile(os.path.join(input_dir, "resume_simple.yaml"))
+    return _scan_input_dir()[_SIMPLE_YAML.name]
 
-async def create_modular_resume(simple_resume_path: str) -> bool:
+def invalidate_cache():
     """
-    Create a modular resume from a simple resume file.
+    Clear the cached scan of the input directory.
+    """
+    _scan_input_dir.cache_clear()
+
+def _create_modularizer() -> "ResumeModularizer":
+    """
+    Import and create the resume modularizer agent.
+    The agents package is imported here so --help and early exits don't load it.
+    
+    Returns:
+        ResumeModularizer: A new modularizer agent
+    """
+    if __package__:
+        from .agents import ResumeModularizer
+    else:
+        from agents import ResumeModularizer
+    return ResumeModularizer()
+
+def _hash_file(path: str, st: Optional[os.stat_result] = None) -> str:
+    """
+    Compute a content hash of a file, reading it in chunks.
+    The hash is memoized per path, size and modification time, so an unchanged file is only read once.
     
     Args:
-        simple_resume_path (str): Path to the simple resume file
+        path (str): Path to the file
+        st (Optional[os.stat_result]): A stat result for the file, if already available
         
     Returns:
-        bool: True if successful, False otherwise
+        str: Hex digest of the file contents
     """
-    log_async_start(logger, "create_modular_resume")
-    
-    # Create the resume modularizer agent
-    modularizer = ResumeModularizer()
-    
-    # Process the resume
-    logger.info("Converting simple resume to modular format...")
-    modular_resume = await modularizer.process_resume(simple_resume_path)
+    if st is None:
+        st = os.stat(path)
+    return _hash_file_contents(os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+@lru_cache(maxsize=32)
+def _hash_file_contents(path: str, size: int, mtime_ns: int) -> str:
+    """
+    Hash a file's contents. The size and modification time only serve as the memoization key.
     
-    if not modular_resume:
-        logger.error("Error processing the resume.")
-        log_async_complete(logger, "create_modular_resume")
-        return False
+    Args:
+        path (str): Absolute path to the file
+        size (int): File size in bytes
+        mtime_ns (int): File modification time in nanoseconds
+        
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _modular_cache_key(simple_resume_path: str, modularizer: "ResumeModularizer") -> str:
+    """
+    Build the cache key for a modular resume. It covers the simple resume's contents
+    and the modularizer's prompt version and model, so changing either invalidates the cache.
     
-    # Save the modular resume
-    input_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "input")
-    output_path = os.path.join(input_dir, "resume.yaml")
+    Args:
+        simple_resume_path (str): Path to the simple resume file
+        modularizer (ResumeModularizer): The modularizer agent that would do the conversion
+        
+    Returns:
+        str: Hex digest identifying the conversion
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (modularizer.PROMPT_VERSION, modularizer.MODEL, _hash_file(simple_resume_path)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+async def create_modular_resume(simple_resume_path: str, modularizer: Optional["ResumeModularizer"] = None,
+                                use_cache: bool = True) -> bool:
+    """
+    Create a modular resume from a simple resume file.
     
-    result = modularizer.save_modular_resume(modular_resume, output_path)
-    log_async_complete(logger, "create_modular_resume")
-    return result
+    Args:
+        simple_resume_path (str): Path to the simple resume file
+        modularizer (Optional[ResumeModularizer]): A pre-built modularizer agent. One is created if not provided.
+        use_cache (bool): Whether to reuse a modular resume or bullet point conversions cached from identical input
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    async with log_async_phase(logger, "create_modular_resume"):
+        # Create the resume modularizer agent
+        modularizer = modularizer or _create_modularizer()
+        
+        # Reuse the modular resume created from an identical simple resume with the same prompt and model, if any
+        cache_path = None
+        if use_cache:
+            cache_path = _CACHE_DIR / f"{_modular_cache_key(simple_resume_path, modularizer)}.yaml"
+            if cache_path.is_file():
+                try:
+                    shutil.copyfile(cache_path, _MODULAR_YAML)
+                except OSError as e:
+                    logger.warning("Could not use cached modular resume, converting again: %s", e)
+                else:
+                    logger.info("Using cached modular resume for %s", simple_resume_path)
+                    invalidate_cache()
+                    return True
+        
+        # Process the resume, sharing one connection pool across all bullet point conversions
+        import aiohttp
+        
+        logger.info("Converting simple resume to modular format...")
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=30)
+        ) as http_session:
+            modularizer.http_session = http_session
+            try:
+                modular_resume, fully_converted = await modularizer.process_resume(simple_resume_path, use_cache)
+            finally:
+                modularizer.http_session = None
+        
+        if not modular_resume:
+            logger.error("Error processing the resume.")
+            return False
+        
+        # Save the modular resume through a pre-opened descriptor, off the event loop
+        try:
+            _MODULAR_YAML.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(_MODULAR_YAML, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        except OSError as e:
+            logger.error("Error opening %s: %s", _MODULAR_YAML, e)
+            return False
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                None, modularizer.save_modular_resume_fd, modular_resume, fd
+            )
+        finally:
+            os.close(fd)
+        invalidate_cache()
+        if result:
+            logger.info("Modular resume saved to %s", _MODULAR_YAML)
+        
+        # Only cache complete conversions, so bullet points that fell back to the basic structure are retried next run
+        if result and cache_path is not None and not fully_converted:
+            logger.warning("Some bullet points could not be converted; not caching this modular resume.")
+        elif result and cache_path is not None:
+            try:
+                _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(_MODULAR_YAML, cache_path)
+            except OSError as e:
+                logger.warning("Could not cache modular resume: %s", e)
+        
+        return result
 
 def provide_resume_simple_instructions():
     """
     Provide instructions for creating a resume_simple.yaml file.
     """
-    logger.info("\nTo create a simple resume file for modularization:")
-    logger.info("1. Create a file named 'resume_simple.yaml' in the 'input' directory.")
-    logger.info("2. Follow this structure for your file:")
+    logger.info(
+        "\nTo create a simple resume file for modularization:\n"
+        "1. Create a file named 'resume_simple.yaml' in the 'input' directory.\n"
+        "2. Follow this structure for your file:"
+    )
     
-    template = """
-basics:
-  name: "Your Name"
-  email: "your.email@example.com"
-  phone: "+1 123 456 7890"
-  location: 
-    city: "City"
-    province: "Province"
-    country: "Country"
-    address: "Your Address"
-    postal_code: "A1B 2C3"
-  linkedin: "https://linkedin.com/in/yourusername"
-  
-work:
-  - title_variables:
-      - "Job Title 1"
-      - "Alternative Job Title"
-    start_date: "Jan 2022"
-    end_date: "Present"
-    company:
-      - "Company Name"
-    location: "City, Province, Country"
-    responsibilities_and_accomplishments:
-      - "Your first bullet point describing a responsibility or accomplishment"
-      - "Your second bullet point describing another responsibility or accomplishment"
+    # Flush the text layer first so the template is written after the log lines
+    sys.stdout.flush()
+    sys.stdout.buffer.write(_TEMPLATE_BYTES)
+    sys.stdout.buffer.flush()
+    logger.info("\nOnce you've created this file, run this script again to convert it to a modular format.")
 
-education:
-  - institution: "University Name"
-    degree: "Your Degree"
-    field_of_study: "Your Field"
-    start_date: "2016"
-    year_of_completion: "2020"
+@dataclass
+class _StartupState:
+    """
+    Results of the checks main_async makes before prompting the user.
+    """
+    simple_arg: Optional[str]
+    have_simple_arg: bool
+    have_simple_file: bool
+
+async def _resolve_simple_resume_path(state: _StartupState) -> Optional[str]:
     """
+    Determine which simple resume file to modularize, prompting the user if needed.
     
-    print(template)
-    logger.info("\nOnce you've created this file, run this script again to convert it to a modular format.")
+    Args:
+        state (_StartupState): The checks made at startup
+        
+    Returns:
+        Optional[str]: Path to the simple resume file or None if the user cancelled or none is available
+    """
+    # If simple resume path was provided via command line, use it
+    if state.have_simple_arg:
+        return state.simple_arg
+    
+    default_simple_path = str(_SIMPLE_YAML) if state.have_simple_file else None
+    
+    # Ask if a simple resume file is available
+    response = (await ainput("Do you have a simple resume file available? (Y/n): ")).strip().casefold()
+    if response in _YES:
+        simple_resume_path = await get_input_path(
+            "Please provide the path to your simple resume file",
+            default_simple_path
+        )
+        if not simple_resume_path:
+            logger.error("No valid simple resume file provided. Exiting.")
+        return simple_resume_path
+    
+    # Ask if they want to create a modular version
+    response = (await ainput("Would you like to create a modular version of your resume? (Y/n): ")).strip().casefold()
+    if response not in _YES:
+        logger.info("Exiting without making changes.")
+        return None
+    
+    if not state.have_simple_file:
+        # Provide instructions for creating a simple resume file
+        logger.warning("No simple resume file found.")
+        provide_resume_simple_instructions()
+        return None
+    
+    logger.info("Found simple resume file at: %s", default_simple_path)
+    return default_simple_path
 
-async def main_async():
+def _discard_modularizer(future: asyncio.Future) -> None:
     """
-    Async main function to handle the resume modularization process.
+    Done callback for a modularizer that was built but will not be used.
+    Retrieves the result so a construction failure is logged instead of silently lost.
+    
+    Args:
+        future (asyncio.Future): The future returned when construction was submitted
     """
-    log_async_start(logger, "main_async")
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("Building the resume modularizer failed: %s", future.exception())
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser. Built once on first use and reused afterwards.
     
+    Returns:
+        argparse.ArgumentParser: The argument parser for this script
+    """
     parser = argparse.ArgumentParser(description="Convert a simple resume to a modular format")
     parser.add_argument("--simple", help="Path to the simple resume file", default=None)
     parser.add_argument("--force", action="store_true", help="Force processing even if resume.yaml exists")
-    args = parser.parse_args()
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached modular resumes and bullet point conversions and convert everything again")
+    return parser
+
+async def main_async(argv: Optional[List[str]] = None):
+    """
+    Async main function to handle the resume modularization process.
     
-    # Check if resume.yaml exists and handle accordingly
-    if check_resume_yaml_exists() and not args.force:
-        logger.info("A modular resume file (resume.yaml) already exists.")
-        response = input("Would you like to create a new modular resume? (y/N): ").strip().lower()
+    Args:
+        argv (Optional[List[str]]): Command line arguments to parse. Defaults to sys.argv.
+    """
+    async with log_async_phase(logger, "main_async"):
+        args = _build_parser().parse_args(argv)
+        loop = asyncio.get_running_loop()
         
-        if response not in ("y", "yes"):
-            logger.info("Exiting without making changes.")
-            log_async_complete(logger, "main_async")
-            return
-    
-    # Display welcome message
-    logger.info("===== Resume Modularization Tool =====")
-    
-    # If simple resume path was provided via command line, use it
-    if args.simple and os.path.isfile(args.simple):
-        simple_resume_path = args.simple
-    else:
-        # Check if resume_simple.yaml exists
-        if check_resume_simple_yaml_exists():
-            input_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "input")
-            default_simple_path = os.path.join(input_dir, "resume_simple.yaml")
-        else:
-            default_simple_path = None
+        # Check if resume.yaml exists and handle accordingly
+        if not args.force and await loop.run_in_executor(None, check_resume_yaml_exists):
+            logger.info("A modular resume file (resume.yaml) already exists.")
+            response = (await ainput("Would you like to create a new modular resume? (y/N): ")).strip().casefold()
+            
+            if response not in _YES_EXPLICIT:
+                logger.info("Exiting without making changes.")
+                return
+        
+        # Display welcome message
+        logger.info("===== Resume Modularization Tool =====")
         
-        # Ask if a modular resume file is available
-        response = input("Do you have a simple resume file available? (Y/n): ").strip().lower()
+        # Build the modularizer agent on the default executor while the user answers the prompts below.
+        # run_in_executor submits immediately, so construction starts before the first prompt.
+        modularizer_future = loop.run_in_executor(None, _create_modularizer)
         
-        if response in ("", "y", "yes"):
-            simple_resume_path = get_input_path(
-                "Please provide the path to your simple resume file",
-                default_simple_path
+        try:
+            # Evaluate each file check once up front
+            state = _StartupState(
+                simple_arg=args.simple,
+                have_simple_arg=bool(args.simple) and await loop.run_in_executor(None, _file_stat, args.simple) is not None,
+                have_simple_file=await loop.run_in_executor(None, check_resume_simple_yaml_exists)
             )
             
-            if not simple_resume_path:
-                logger.error("No valid simple resume file provided. Exiting.")
-                log_async_complete(logger, "main_async")
-                return
+            simple_resume_path = await _resolve_simple_resume_path(state)
+        except BaseException:
+            modularizer_future.add_done_callback(_discard_modularizer)
+            raise
+        
+        if not simple_resume_path:
+            modularizer_future.add_done_callback(_discard_modularizer)
+            return
+        
+        # Create the modular resume
+        logger.info("Starting resume modularization process...")
+        success = await create_modular_resume(
+            simple_resume_path,
+            await modularizer_future,
+            use_cache=not args.no_cache
+        )
+        
+        if success:
+            logger.info("\n✅ Modular resume created successfully!")
+            logger.info("You can now use this modular resume with the main application for job-specific customization.")
         else:
-            # Ask if they want to create a modular version
-            response = input("Would you like to create a modular version of your resume? (Y/n): ").strip().lower()
-            
-            if response in ("", "y", "yes"):
-                # Check if resume_simple.yaml exists
-                if check_resume_simple_yaml_exists():
-                    input_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "input")
-                    simple_resume_path = os.path.join(input_dir, "resume_simple.yaml")
-                    logger.info(f"Found simple resume file at: {simple_resume_path}")
-                else:
-                    # Provide instructions for creating a simple resume file
-                    logger.warning("No simple resume file found.")
-                    provide_resume_simple_instructions()
-                    log_async_complete(logger, "main_async")
-                    return
-            else:
-                logger.info("Exiting without making changes.")
-                log_async_complete(logger, "main_async")
-                return
-    
-    # Create the modular resume
-    logger.info("Starting resume modularization process...")
-    success = await create_modular_resume(simple_resume_path)
-    
-    if success:
-        logger.info("\n✅ Modular resume created successfully!")
-        logger.info("You can now use this modular resume with the main application for job-specific customization.")
-    else:
-        logger.error("\n❌ Failed to create modular resume. Please check the logs for errors.")
-    
-    log_async_complete(logger, "main_async")
+            logger.error("\n❌ Failed to create modular resume. Please check the logs for errors.")
 
 def main():
     """
     Main function that sets up and runs the async event loop.
+    Uses uvloop when it is installed, otherwise the default asyncio loop.
     """
-    asyncio.run(main_async())
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main_async())
+        return
+    
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main_async())
+    else:
+        uvloop.install()
+        asyncio.run(main_async())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file